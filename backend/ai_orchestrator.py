@@ -1,10 +1,10 @@
 import time
-import json
 import asyncio
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import logging
-import httpx
-from backend.schemas import OrchestrateRequest
+import aiohttp
+import orjson
+from backend.schemas import MAX_CONTEXT_TURNS, ConversationTurn, OrchestrateRequest
 
 logging.basicConfig(level=logging.INFO)
 
@@ -12,7 +12,8 @@ logging.basicConfig(level=logging.INFO)
 # OLLAMA CONFIG
 
 
-OLLAMA_BASE_URL = "http://localhost:11434/v1/chat/completions"
+OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_BASE_URL = f"{OLLAMA_HOST}/v1/chat/completions"
 OLLAMA_API_KEY = "ollama"
 
 QUESTION_MODEL = "llama3.2"
@@ -25,38 +26,82 @@ COMPETITOR_MODELS = [
 
 JUDGE_MODEL = "llama3.2"
 
+COMPETITOR_TIMEOUT_SEC = 60
+
+
+
+# HTTP CLIENT
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    # Shared across requests so Ollama connections are kept alive
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=64,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        ),
+        timeout=aiohttp.ClientTimeout(total=None, sock_connect=5.0)
+    )
+
 
 
 # HTTP HELPER
 
 
-async def ollama_chat(
-    client: httpx.AsyncClient,
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def build_chat_payload(
     model: str,
     messages: List[Dict[str, str]],
     temperature: float = 0.0,
-    response_format: str = None
-) -> str:
+    response_format: str = None,
+    max_tokens: int = 500
+) -> Dict:
 
     payload = {
         "model": model,
         "messages": messages,
         "temperature": temperature,
-        "max_tokens": 500
+        "max_tokens": max_tokens
     }
 
+    # The OpenAI-compatible endpoint ignores Ollama's native "format" field
     if response_format == "json":
-        payload["format"] = "json"
+        payload["response_format"] = {"type": "json_object"}
 
-    response = await client.post(
-        OLLAMA_BASE_URL,
-        json=payload,
-        timeout=None
+    return payload
+
+
+async def ollama_chat(
+    client: aiohttp.ClientSession,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float = 0.0,
+    max_tokens: int = 500
+) -> str:
+
+    payload = build_chat_payload(
+        model,
+        messages,
+        temperature,
+        max_tokens=max_tokens
     )
 
-    response.raise_for_status()
+    return await ollama_chat_raw(client, orjson.dumps(payload))
+
+
+async def ollama_chat_raw(client: aiohttp.ClientSession, body: bytes) -> str:
+
+    async with client.post(
+        OLLAMA_BASE_URL,
+        data=body,
+        headers=JSON_HEADERS
+    ) as response:
+        response.raise_for_status()
+        data = orjson.loads(await response.read())
 
-    data = response.json()
     return data["choices"][0]["message"]["content"].strip()
 
 
@@ -64,27 +109,20 @@ async def ollama_chat(
 # CONTEXT BUILDER
 
 
-def build_context_block(conversation: List[Dict]) -> str:
+def build_context_block(conversation: List[ConversationTurn]) -> str:
     if not conversation:
         return ""
 
-    context_text = "Previous Conversation Context:\n\n"
+    # One line per turn; prior answer bodies are left out to keep prefill small
+    parts = ["Previous Conversation Context:\n\n"]
 
     for idx, turn in enumerate(conversation):
-        context_text += f"Turn {idx + 1}:\n"
-        context_text += f"Question: {turn.get('question')}\n"
-
-        answers = turn.get("answers", [])
-        for i, ans in enumerate(answers):
-            context_text += f"Competitor {i+1}: {ans}\n"
+        line = f"Turn {idx + 1}: Q={turn.question}"
+        if turn.ranking:
+            line += f", winner=competitor_{turn.ranking[0]}"
+        parts.append(f"{line}\n")
 
-        ranking = turn.get("ranking")
-        if ranking:
-            context_text += f"Ranking: {ranking}\n"
-
-        context_text += "\n"
-
-    return context_text
+    return "".join(parts)
 
 
 
@@ -100,31 +138,75 @@ def build_initial_messages() -> List[Dict[str, str]]:
     return [{"role": "user", "content": request}]
 
 
-async def generate_question(client: httpx.AsyncClient) -> Tuple[str, float]:
-    start = time.time()
+async def generate_question(client: aiohttp.ClientSession) -> Tuple[str, float]:
+    start = time.perf_counter()
 
     question = await ollama_chat(
         client,
         QUESTION_MODEL,
-        build_initial_messages()
+        build_initial_messages(),
+        max_tokens=128
     )
 
-    return question, time.time() - start
+    return question, time.perf_counter() - start
 
 
 
 # COMPETITOR GENERATION (CONTEXT-AWARE)
 
 
+async def prefill_context(
+    client: aiohttp.ClientSession,
+    model: str,
+    context_block: str
+) -> None:
+
+    # Competitor prompts start with the context block, so a 1-token call on it
+    # warms Ollama's prompt cache while the question is still being generated
+    try:
+        await ollama_chat(
+            client,
+            model,
+            [{"role": "user", "content": context_block}],
+            max_tokens=1
+        )
+    except Exception as e:
+        logging.warning(f"Context prefill for {model} failed: {str(e)}")
+
+
+async def competitor_answer(
+    client: aiohttp.ClientSession,
+    model: str,
+    messages: List[Dict[str, str]],
+    prefill: Optional[asyncio.Task] = None
+) -> str:
+
+    async def answer() -> str:
+        # Only this model's prefill is awaited; it counts against the timeout
+        if prefill is not None:
+            await prefill
+        return await ollama_chat(client, model, messages)
+
+    # A hung model yields an empty answer instead of stalling the judge phase
+    try:
+        return await asyncio.wait_for(answer(), COMPETITOR_TIMEOUT_SEC)
+    except aiohttp.ConnectionTimeoutError as e:
+        # Socket connect timeouts also subclass TimeoutError
+        logging.warning(f"Competitor {model} connection timed out: {e!r}")
+        return ""
+    except TimeoutError:
+        logging.warning(f"Competitor {model} timed out after {COMPETITOR_TIMEOUT_SEC}s")
+        return ""
+
+
 async def generate_competitor_answers(
-    client: httpx.AsyncClient,
+    client: aiohttp.ClientSession,
     question: str,
-    conversation: List[Dict]
+    context_block: str,
+    prefills: Optional[Dict[str, asyncio.Task]] = None
 ) -> Tuple[List[str], List[str], float]:
 
-    start = time.time()
-
-    context_block = build_context_block(conversation)
+    start = time.perf_counter()
 
     full_prompt = f"""
 {context_block}
@@ -137,17 +219,30 @@ Provide your best possible answer considering the previous context if relevant.
 
     messages = [{"role": "user", "content": full_prompt}]
 
-    tasks = [
-        ollama_chat(client, model, messages)
-        for model in COMPETITOR_MODELS
-    ]
+    # One request per unique model; repeated models share the result
+    groups: Dict[str, List[int]] = {}
+    for idx, model in enumerate(COMPETITOR_MODELS):
+        groups.setdefault(model, []).append(idx)
 
-    answers = await asyncio.gather(*tasks)
+    prefills = prefills or {}
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(
+                competitor_answer(client, model, messages, prefills.get(model))
+            )
+            for model in groups
+        ]
+
+    answers = [""] * len(COMPETITOR_MODELS)
+    for positions, task in zip(groups.values(), tasks):
+        for idx in positions:
+            answers[idx] = task.result()
 
     return (
         COMPETITOR_MODELS,
         answers,
-        time.time() - start
+        time.perf_counter() - start
     )
 
 
@@ -155,53 +250,75 @@ Provide your best possible answer considering the previous context if relevant.
 # JUDGE PROMPT (CONTEXT-AWARE)
 
 
-def build_judge_prompt(
-    question: str,
-    answers: List[str],
-    conversation: List[Dict]
-) -> str:
-
-    context_block = build_context_block(conversation)
-
-    combined = ""
-    for i, answer in enumerate(answers):
-        combined += f"Competitor {i+1}:\n{answer}\n\n"
-
-    return f"""
-You must rank the competitors from best to worst.
-
-{context_block}
-
-Current Question:
-{question}
-
-Responses:
-{combined}
+JUDGE_HEADER = "You must rank the competitors from best to worst.\n\n"
 
-Return ONLY valid JSON in this exact structure:
+JUDGE_RULES = """Return ONLY valid JSON in this exact structure:
 
-{{
+{
   "results": [list_of_competitor_numbers_in_best_to_worst_order]
-}}
+}
 
 Rules:
 - No explanations
 - No markdown
 - No commentary
 - No extra text
-- Strict JSON only
-""".strip()
+- Strict JSON only"""
+
+# Judge requests differ only in their messages, so the rest of the body is
+# encoded once and the messages are spliced in per call
+def _judge_payload_prefix() -> bytes:
+    payload = build_chat_payload(
+        JUDGE_MODEL,
+        [],
+        temperature=0.0,
+        response_format="json",
+        max_tokens=32
+    )
+    del payload["messages"]
+    return orjson.dumps(payload)[:-1] + b',"messages":'
+
+
+_JUDGE_PAYLOAD_PREFIX = _judge_payload_prefix()
+
+
+def build_judge_payload(messages: List[Dict[str, str]]) -> bytes:
+    return _JUDGE_PAYLOAD_PREFIX + orjson.dumps(messages) + b"}"
+
+
+def build_judge_prompt(
+    question: str,
+    answers: List[str],
+    context_block: str
+) -> str:
+
+    # Competitors that timed out are left out but keep their numbering
+    combined = "".join(
+        f"Competitor {i+1}:\n{answer}\n\n"
+        for i, answer in enumerate(answers)
+        if answer
+    )
+
+    return (
+        f"{JUDGE_HEADER}{context_block}\n\n"
+        f"Current Question:\n{question}\n\n"
+        f"Responses:\n{combined}{JUDGE_RULES}"
+    )
 
 
 async def judge_answers(
-    client: httpx.AsyncClient,
+    client: aiohttp.ClientSession,
     question: str,
     competitors: List[str],
     answers: List[str],
-    conversation: List[Dict]
+    context_block: str
 ) -> Tuple[List[int], float]:
 
-    start = time.time()
+    start = time.perf_counter()
+
+    if not any(answers):
+        logging.error("No competitor answers to judge")
+        return [], time.perf_counter() - start
 
     messages = [
         {
@@ -210,17 +327,11 @@ async def judge_answers(
         },
         {
             "role": "user",
-            "content": build_judge_prompt(question, answers, conversation)
+            "content": build_judge_prompt(question, answers, context_block)
         }
     ]
 
-    raw_output = await ollama_chat(
-        client,
-        JUDGE_MODEL,
-        messages,
-        temperature=0.0,
-        response_format="json"
-    )
+    raw_output = await ollama_chat_raw(client, build_judge_payload(messages))
 
     logging.info("----- JUDGE RAW OUTPUT START -----")
     logging.info(raw_output)
@@ -229,12 +340,14 @@ async def judge_answers(
     ranking = []
 
     try:
-        raw = raw_output.strip()
+        # response_format json_object normally yields a clean document; only
+        # scan for the JSON object when the model wrapped it in extra text
+        try:
+            parsed = orjson.loads(raw_output)
+        except orjson.JSONDecodeError:
+            raw = raw_output[raw_output.find("{"): raw_output.rfind("}") + 1]
+            parsed = orjson.loads(raw)
 
-        if "{" in raw and "}" in raw:
-            raw = raw[raw.find("{"): raw.rfind("}") + 1]
-
-        parsed = json.loads(raw)
         ranking = parsed.get("results", [])
 
         if not isinstance(ranking, list):
@@ -244,46 +357,65 @@ async def judge_answers(
         logging.error(f"Judge parsing failed: {str(e)}")
         ranking = []
 
-    return ranking, time.time() - start
+    return ranking, time.perf_counter() - start
 
 # FULL ORCHESTRATION (CONTEXT ENABLED)
 
 
-async def run_orchestration(request: OrchestrateRequest) -> Dict:
-    total_start = time.time()
+async def run_orchestration(
+    client: aiohttp.ClientSession,
+    request: OrchestrateRequest
+) -> Dict:
+    total_start = time.perf_counter()
+
+    conversation = request.conversation or []
+
+    # Shared by the competitor and judge prompts
+    context_block = build_context_block(conversation)
 
-    MAX_TURNS = 5
-    conversation = request.conversation[-MAX_TURNS:] if request.conversation else []
+    # Question generation, with competitor prefills running alongside it
+    question_task = asyncio.create_task(generate_question(client))
 
-    async with httpx.AsyncClient() as client:
+    # QUESTION_MODEL is skipped: its prefill would compete with the question
+    # call, and that call would then evict the prefilled cache anyway
+    prefills = {
+        model: asyncio.create_task(prefill_context(client, model, context_block))
+        for model in dict.fromkeys(COMPETITOR_MODELS)
+        if model != QUESTION_MODEL
+    } if context_block else {}
 
-        # Question generation
-        question, q_latency = await generate_question(client)
+    try:
+        question, q_latency = await question_task
 
         # Competitors
         competitors, answers, c_latency = await generate_competitor_answers(
             client,
             question,
-            conversation
+            context_block,
+            prefills
         )
+    finally:
+        question_task.cancel()
+        for task in prefills.values():
+            task.cancel()
 
-        # Judge
-        ranking, j_latency = await judge_answers(
-            client,
-            question,
-            competitors,
-            answers,
-            conversation
-        )
+    # Judge
+    ranking, j_latency = await judge_answers(
+        client,
+        question,
+        competitors,
+        answers,
+        context_block
+    )
 
-    total_time = round(time.time() - total_start, 3)
+    total_time = round(time.perf_counter() - total_start, 3)
 
-    # Append new turn
-    updated_conversation = conversation + [{
+    # Append new turn, keeping the history small enough to be sent back
+    updated_conversation = [turn.model_dump() for turn in conversation] + [{
         "question": question,
-        "answers": answers,
         "ranking": ranking
     }]
+    updated_conversation = updated_conversation[-MAX_CONTEXT_TURNS:]
 
     response_payload = {
         "question": question,
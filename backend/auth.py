@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -40,7 +41,7 @@ async def authenticate_user(email: str, password: str):
     if not user:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    if not await asyncio.to_thread(verify_password, password, user.hashed_password):
         return None
 
     return user
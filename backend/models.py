@@ -1,6 +1,7 @@
 from beanie import Document
 from pydantic import Field
 from datetime import datetime
+from pymongo import IndexModel
 
 
 
@@ -11,6 +12,9 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("email", 1)], unique=True)
+        ]
 
 
 from beanie import Document
@@ -38,3 +42,7 @@ class OrchestrationRun(Document):
 
     class Settings:
         name = "orchestration_runs"
+        indexes = [
+            [("user_id", 1), ("created_at", -1)],
+            "session_id"
+        ]
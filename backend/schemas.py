@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 
 
 # =====================================================
@@ -7,6 +7,13 @@ from typing import List, Optional, Dict, Any
 # =====================================================
 
 
+MAX_CONTEXT_TURNS = 5
+
+
+class ConversationTurn(BaseModel):
+    question: str
+    ranking: List[int] = Field(default_factory=list)
+
 
 class OrchestrateRequest(BaseModel):
     session_id: str = Field(
@@ -19,9 +26,10 @@ class OrchestrateRequest(BaseModel):
         description="Optional user-provided question"
     )
 
-    conversation: Optional[List[Dict[str, Any]]] = Field(
+    conversation: Optional[List[ConversationTurn]] = Field(
         default_factory=list,
-        description="Conversation history for contextual orchestration"
+        max_length=MAX_CONTEXT_TURNS,
+        description="Most recent turns (question + ranking) for contextual orchestration"
     )
 
     num_competitors: int = Field(
@@ -56,3 +64,8 @@ class OrchestrateResponse(BaseModel):
     answers: List[str]
     ranking: List[int]
     latency: LatencyBreakdown
+    conversation: List[ConversationTurn] = Field(
+        default_factory=list,
+        max_length=MAX_CONTEXT_TURNS,
+        description="Updated history, valid as the next request's conversation"
+    )
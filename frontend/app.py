@@ -3,6 +3,7 @@ import requests
 import logging
 import uuid
 import time
+from collections import deque
 
 
 # CONFIG
@@ -13,6 +14,9 @@ LOGIN_URL = f"{BACKEND_BASE_URL}/login"
 SIGNUP_URL = f"{BACKEND_BASE_URL}/signup"
 ORCHESTRATE_URL = f"{BACKEND_BASE_URL}/orchestrate"
 
+# Backend rejects longer histories; only question + ranking are sent per turn
+MAX_CONTEXT_TURNS = 5
+
 logging.basicConfig(level=logging.INFO)
 
 
@@ -87,7 +91,7 @@ def initialize_session():
 
     return {
         "session_id": session_id,
-        "conversation": [],
+        "conversation": deque(maxlen=MAX_CONTEXT_TURNS),
         "runs": [],
         "last_run": None,
         "created_at": time.time()
@@ -112,7 +116,7 @@ def run_orchestration(session_state, token):
         payload = {
             "session_id": session_id,
             "question": None,
-            "conversation": session_state["conversation"],
+            "conversation": list(session_state["conversation"]),
             "num_competitors": 3,
             "temperature": 0.7
         }
@@ -148,15 +152,20 @@ def run_orchestration(session_state, token):
             "latency_breakdown": latency
         }
 
+        conversation = deque(
+            session_state["conversation"],
+            maxlen=MAX_CONTEXT_TURNS
+        )
+        conversation.append({
+            "question": question,
+            "ranking": ranking
+        })
+
         updated_session = {
             **session_state,
             "runs": session_state["runs"] + [run_record],
             "last_run": run_record,
-            "conversation": session_state["conversation"] + [{
-                "role": "system",
-                "question": question,
-                "ranking": ranking
-            }]
+            "conversation": conversation
         }
 
         formatted_output = f"""